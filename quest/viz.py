@@ -6,9 +6,11 @@ Usage: /Users/jordan/Dropbox/typogenetics/quest/venv/bin/python3 quest/viz.py [c
 If no config_name given, processes all JSON files found.
 """
 
+import hashlib
 import json
 import sys
 import os
+from multiprocessing import Pool
 from pathlib import Path
 
 import matplotlib
@@ -18,53 +20,103 @@ import matplotlib.cm as cm
 import networkx as nx
 import numpy as np
 
+# networkx routes spring_layout through scipy's sparse solver for graphs
+# of 500+ nodes — O(E) per iteration instead of a dense O(V^2) matrix —
+# but only if scipy imports; probe once so big graphs fail loudly
+try:
+    import scipy.sparse  # noqa: F401
+    _HAVE_SCIPY = True
+except ImportError:
+    _HAVE_SCIPY = False
+
+# Fastest available JSON parser for MB-scale findings files: orjson,
+# then ujson, then stdlib. All three accept the bytes load_result reads.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        _loads = ujson.loads
+    except ImportError:
+        _loads = json.loads
+
 DATA_DIR = Path(__file__).parent.parent / 'data' / 'quest_findings'
 
+# tab20 palette for up to TOP_N strands + 'other', sampled once at import
+_STACK_COLORS = plt.cm.tab20(np.linspace(0, 1, 21))
+
 
 def load_result(name: str) -> dict:
     path = DATA_DIR / f'{name}.json'
-    with open(path) as f:
-        return json.load(f)
+    with open(path, 'rb') as f:  # binary — orjson wants bytes
+        return _loads(f.read())
 
 
-def render_production_graph(result: dict, out_path: Path):
-    """Force-directed production graph. Nodes = strands, edges = production relationships."""
-    edges = result['productionEdges']
-    if not edges:
-        print(f"  No production edges, skipping graph")
-        return
-
+def build_production_graph(result: dict) -> nx.DiGraph:
+    """Build the production DiGraph once so both graph renderers can share it."""
     G = nx.DiGraph()
-    for e in edges:
-        G.add_edge(e['catalyst'], e['product'], weight=e['count'])
+    G.add_weighted_edges_from(
+        (e['catalyst'], e['product'], e['count']) for e in result['productionEdges'])
+    return G
+
+
+def spring_layout_cached(G: nx.DiGraph) -> dict:
+    """The 100-iteration force-directed solve dominates graph rendering;
+    cache positions on disk keyed by the edge set so re-running viz on
+    unchanged data skips it entirely."""
+    edge_hash = hashlib.sha1(
+        repr(sorted(G.edges(data='weight'))).encode()).hexdigest()[:16]
+    cache_path = DATA_DIR / f'.layout_{edge_hash}.npz'
+    if cache_path.exists():
+        cached = np.load(cache_path)
+        return dict(zip(cached['nodes'], cached['positions']))
+
+    if len(G.nodes) >= 500 and not _HAVE_SCIPY:
+        raise RuntimeError(
+            f'{len(G.nodes)}-node graph needs scipy for the sparse '
+            f'spring_layout path; pip install scipy')
+    pos = nx.spring_layout(G, k=2.0 / (len(G.nodes) ** 0.5) if len(G.nodes) > 1 else 1,
+                           iterations=100, seed=42)
+    nodes = list(pos)
+    np.savez(cache_path, nodes=np.array(nodes),
+             positions=np.array([pos[n] for n in nodes]))
+    return pos
+
+
+def render_production_graph(result: dict, ax, G: nx.DiGraph = None):
+    """Force-directed production graph. Nodes = strands, edges = production relationships."""
+    if G is None:
+        G = build_production_graph(result)
 
     if len(G.nodes) == 0:
+        print(f"  No production edges, skipping graph")
         return
 
-    # Node sizing by total degree (in + out)
-    degrees = dict(G.degree())
-    max_deg = max(degrees.values()) if degrees else 1
-    node_sizes = [300 + 1500 * (degrees.get(n, 0) / max_deg) for n in G.nodes]
+    # Node sizing by total degree (in + out) — the degree views iterate in
+    # G.nodes order, so feed them straight into fromiter with no dict step
+    deg = np.fromiter((d for _, d in G.degree()), dtype=np.float32, count=len(G.nodes))
+    node_sizes = 300.0 + 1500.0 * (deg / deg.max())
 
     # Node coloring by in-degree (how many things produce it)
-    in_degrees = dict(G.in_degree())
-    max_in = max(in_degrees.values()) if in_degrees else 1
-    node_colors = [in_degrees.get(n, 0) / max_in for n in G.nodes]
+    in_deg = np.fromiter((d for _, d in G.in_degree()), dtype=np.float32, count=len(G.nodes))
+    node_colors = in_deg / in_deg.max()
 
     # Edge widths by weight
-    weights = [G[u][v]['weight'] for u, v in G.edges]
-    max_w = max(weights) if weights else 1
-    edge_widths = [0.5 + 3.0 * (w / max_w) for w in weights]
+    weights = np.fromiter((G[u][v]['weight'] for u, v in G.edges), dtype=np.float32, count=len(G.edges))
+    max_w = weights.max()
+    edge_widths = 0.5 + 3.0 * (weights / max_w)
 
-    # Find mutual pairs for highlighting
-    mutual_edges = []
-    for u, v in G.edges:
-        if G.has_edge(v, u):
-            mutual_edges.append((u, v))
+    # Find mutual pairs for highlighting — one pass over a hash set instead
+    # of a has_edge call (two dict probes) per edge. Kept as indices into
+    # the G.edges order so widths can reuse the weights array.
+    edge_list = list(G.edges)
+    edge_set = set(edge_list)
+    mutual_idx = np.array([i for i, (u, v) in enumerate(edge_list) if (v, u) in edge_set],
+                          dtype=np.intp)
+    mutual_edges = [edge_list[i] for i in mutual_idx]
 
-    fig, ax = plt.subplots(1, 1, figsize=(14, 14))
-
-    pos = nx.spring_layout(G, k=2.0 / (len(G.nodes) ** 0.5) if len(G.nodes) > 1 else 1, iterations=100, seed=42)
+    pos = spring_layout_cached(G)
 
     # Draw all edges
     nx.draw_networkx_edges(G, pos, ax=ax, edge_color='#cccccc', width=edge_widths,
@@ -73,7 +125,7 @@ def render_production_graph(result: dict, out_path: Path):
 
     # Highlight mutual edges in red
     if mutual_edges:
-        mutual_widths = [0.5 + 3.0 * (G[u][v]['weight'] / max_w) for u, v in mutual_edges]
+        mutual_widths = 0.5 + 3.0 * (weights[mutual_idx] / max_w)
         nx.draw_networkx_edges(G, pos, edgelist=mutual_edges, ax=ax,
                                edge_color='red', width=mutual_widths,
                                alpha=0.7, arrows=True, arrowsize=12,
@@ -85,8 +137,9 @@ def render_production_graph(result: dict, out_path: Path):
                                     alpha=0.85, edgecolors='black', linewidths=0.5)
 
     # Labels — only for top nodes by degree
-    top_n = min(25, len(G.nodes))
-    top_nodes = sorted(G.nodes, key=lambda n: degrees.get(n, 0), reverse=True)[:top_n]
+    node_list = list(G.nodes)
+    top_n = min(25, len(node_list))
+    top_nodes = [node_list[i] for i in np.argpartition(-deg, top_n - 1)[:top_n]]
     labels = {n: n[:8] + '..' if len(n) > 10 else n for n in top_nodes}
     nx.draw_networkx_labels(G, pos, labels, ax=ax, font_size=6, font_weight='bold')
 
@@ -95,59 +148,77 @@ def render_production_graph(result: dict, out_path: Path):
                  f"{len(G.nodes)} nodes, {len(G.edges)} edges, "
                  f"{len(mutual_edges)} mutual edges (red)",
                  fontsize=12)
-    plt.colorbar(nodes, ax=ax, label='In-degree (normalized)', shrink=0.6)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
-    plt.close()
-    print(f"  Saved {out_path}")
+    ax.figure.colorbar(nodes, ax=ax, label='In-degree (normalized)', shrink=0.6)
 
 
-def render_pool_composition(result: dict, out_path: Path):
+def render_pool_composition(result: dict, ax1, ax2):
     """Stacked area chart showing pool composition over time."""
     snapshots = result['snapshots']
     if len(snapshots) < 2:
         print(f"  Too few snapshots, skipping composition chart")
         return
 
-    # Collect all strands that ever appear
-    all_strands = set()
-    for snap in snapshots:
-        all_strands.update(snap['pool'].keys())
-
-    # Find the top N most frequent strands (by max count across snapshots)
-    strand_max = {}
-    for s in all_strands:
-        strand_max[s] = max(snap['pool'].get(s, 0) for snap in snapshots)
-
+    # Pivot snapshots into a dense (n_snapshots, n_strands) matrix so the
+    # max / top-N / stacking passes run in C instead of nested dict lookups
+    pools = [snap['pool'] for snap in snapshots]  # hoist the per-snap lookup
+    strand_idx = {}
+    for pool in pools:
+        for s in pool:
+            if s not in strand_idx:
+                strand_idx[s] = len(strand_idx)
+
+    M = np.zeros((len(snapshots), len(strand_idx)), dtype=np.int32)
+    for i, pool in enumerate(pools):
+        for s, count in pool.items():
+            M[i, strand_idx[s]] = count
+
+    strand_names = np.array(list(strand_idx))
+
+    # Find the top N most frequent strands (by max count across snapshots).
+    # argpartition is O(S) vs O(S log S) for a full sort; only the winners
+    # get sorted for stable legend ordering.
+    strand_max = M.max(axis=0)
     TOP_N = 20
-    top_strands = sorted(all_strands, key=lambda s: strand_max[s], reverse=True)[:TOP_N]
-
-    ops = [snap['op'] for snap in snapshots]
-    strand_counts = {s: [snap['pool'].get(s, 0) for snap in snapshots] for s in top_strands}
-
-    # "Other" category
-    other = []
-    for i, snap in enumerate(snapshots):
-        total = snap['poolSize']
-        top_total = sum(strand_counts[s][i] for s in top_strands)
-        other.append(total - top_total)
-
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
-
-    # Stacked area
-    arrays = [strand_counts[s] for s in top_strands] + [other]
+    if len(strand_max) > TOP_N:
+        top_idx = np.argpartition(-strand_max, TOP_N)[:TOP_N]
+    else:
+        top_idx = np.arange(len(strand_max))
+    top_idx = top_idx[np.argsort(-strand_max[top_idx])]
+    top_strands = strand_names[top_idx]
+
+    ops = np.array([snap['op'] for snap in snapshots])
+    pool_sizes = np.array([snap['poolSize'] for snap in snapshots])
+    unique_counts = np.array([snap['uniqueCount'] for snap in snapshots])
+
+    # Top strands as rows, plus an "other" remainder row
+    arrays = M[:, top_idx].T
+    other = pool_sizes - M[:, top_idx].sum(axis=1)
+    stack = np.vstack([arrays, other])
+
+    # Decimate long runs before matplotlib sees them — at 150 DPI anything
+    # past ~2000 points is sub-pixel. Max-pool the stacked series to keep
+    # visual peaks, mean-pool the trend lines.
+    MAX_POINTS = 2000
+    if len(snapshots) > MAX_POINTS:
+        bin_size = len(snapshots) // MAX_POINTS
+        n_trunc = (len(snapshots) // bin_size) * bin_size
+        stack = stack[:, :n_trunc].reshape(stack.shape[0], -1, bin_size).max(axis=2)
+        pool_sizes = pool_sizes[:n_trunc].reshape(-1, bin_size).mean(axis=1)
+        unique_counts = unique_counts[:n_trunc].reshape(-1, bin_size).mean(axis=1)
+        ops = ops[:n_trunc:bin_size]
+
+    # Stacked area — stackplot takes the 2D array directly
     labels_list = [s[:12] for s in top_strands] + ['other']
-    colors = plt.cm.tab20(np.linspace(0, 1, len(arrays)))
+    colors = _STACK_COLORS[:len(stack)]
 
-    ax1.stackplot(ops, *arrays, labels=labels_list, colors=colors, alpha=0.8)
+    ax1.stackplot(ops, stack, labels=labels_list, colors=colors, alpha=0.8)
     ax1.set_xlabel('Operations')
     ax1.set_ylabel('Count in pool')
-    ax1.set_title(f"Pool Composition: {result['config']['name']}")
+    name = result['config']['name']
+    ax1.set_title(f"Pool Composition: {name}")
     ax1.legend(loc='upper left', fontsize=5, ncol=3)
 
     # Unique count over time
-    unique_counts = [snap['uniqueCount'] for snap in snapshots]
-    pool_sizes = [snap['poolSize'] for snap in snapshots]
     ax2.plot(ops, pool_sizes, label='Pool size', color='blue', alpha=0.7)
     ax2.plot(ops, unique_counts, label='Unique strands', color='red', alpha=0.7)
     ax2.set_xlabel('Operations')
@@ -155,77 +226,89 @@ def render_pool_composition(result: dict, out_path: Path):
     ax2.set_title('Pool Size & Diversity')
     ax2.legend()
 
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
-    plt.close()
-    print(f"  Saved {out_path}")
 
-
-def render_cycle_analysis(result: dict, out_path: Path):
+def render_cycle_analysis(result: dict, ax, G: nx.DiGraph = None):
     """Find and visualize cycles in the production graph."""
-    edges = result['productionEdges']
-    if not edges:
+    if G is None:
+        G = build_production_graph(result)
+
+    if len(G.edges) == 0:
         return
 
-    G = nx.DiGraph()
-    for e in edges:
-        G.add_edge(e['catalyst'], e['product'], weight=e['count'])
+    # Cheap O(V+E) probe: an acyclic graph has no SCC of size >= 2, so we
+    # can jump straight to the "no cycles" frame without touching
+    # simple_cycles or building the weight map
+    sccs = [c for c in nx.strongly_connected_components(G) if len(c) >= 2]
 
-    # Find all simple cycles up to length 4
+    # Find all simple cycles up to length 4, enumerating per-SCC subgraph
+    # instead of letting simple_cycles scan the whole graph
     cycles = []
-    try:
-        for cycle in nx.simple_cycles(G, length_bound=4):
-            if len(cycle) >= 2:
-                # Calculate total weight of cycle
-                total_w = 0
-                for i in range(len(cycle)):
-                    u, v = cycle[i], cycle[(i + 1) % len(cycle)]
-                    total_w += G[u][v]['weight']
-                cycles.append((cycle, total_w))
-    except Exception:
-        pass
-
-    cycles.sort(key=lambda x: x[1], reverse=True)
-
-    fig, ax = plt.subplots(1, 1, figsize=(12, 8))
+    if sccs:
+        # Flat (u, v) -> weight map: one hash lookup per cycle step instead
+        # of the nested G[u][v]['weight'] dict chain
+        edge_w = {(u, v): w for u, v, w in G.edges(data='weight')}
+        try:
+            for scc in sccs:
+                for cycle in nx.simple_cycles(G.subgraph(scc), length_bound=4):
+                    if len(cycle) >= 2:
+                        # i-1 wraps, closing the cycle back to its first node
+                        total_w = sum(edge_w[cycle[i - 1], cycle[i]] for i in range(len(cycle)))
+                        cycles.append((cycle, total_w))
+        except Exception:
+            pass
 
     if not cycles:
         ax.text(0.5, 0.5, 'No cycles found (length 2-4)',
                 ha='center', va='center', fontsize=16, transform=ax.transAxes)
     else:
-        # Show top 20 cycles as a table
-        top_cycles = cycles[:20]
-        table_data = []
+        # Show top 20 cycles as a table — argpartition picks the winners
+        # without a full keyed sort of the cycle list
+        n_top = min(20, len(cycles))
+        cycle_weights = np.fromiter((w for _, w in cycles), dtype=np.float64, count=len(cycles))
+        keep = np.argpartition(-cycle_weights, n_top - 1)[:n_top]
+        keep = keep[np.argsort(-cycle_weights[keep])]
+        top_cycles = [cycles[i] for i in keep]
+
+        # ax.table builds a Text artist per cell plus a layout pass — for
+        # a 20x3 grid that is the slow part of this panel. A preformatted
+        # monospace block is a single artist.
+        lines = [f"{'Len':<6}{'Cycle':<64}{'Weight':>8}"]
         for cycle, weight in top_cycles:
             cycle_str = ' → '.join(c[:10] for c in cycle) + ' → ' + cycle[0][:10]
-            table_data.append([len(cycle), cycle_str, weight])
+            lines.append(f"{len(cycle):<6}{cycle_str:<64}{weight:>8}")
 
         ax.axis('off')
-        table = ax.table(cellText=table_data,
-                        colLabels=['Length', 'Cycle', 'Total Weight'],
-                        loc='center', cellLoc='left')
-        table.auto_set_font_size(False)
-        table.set_fontsize(7)
-        table.scale(1, 1.5)
+        ax.text(0.02, 0.97, '\n'.join(lines), family='monospace', fontsize=7,
+                va='top', transform=ax.transAxes)
 
     name = result['config']['name']
     ax.set_title(f"Cycles in Production Graph: {name}\n"
                  f"{len(cycles)} cycles found (length 2-4)",
                  fontsize=12, pad=20)
 
+
+def render_all(result: dict, out_path: Path, G: nx.DiGraph = None):
+    """Render all three panels into one figure — one Agg setup, savefig and
+    PNG encode per file instead of three."""
+    if G is None:
+        G = build_production_graph(result)
+
+    fig, axes = plt.subplots(4, 1, figsize=(14, 32),
+                             height_ratios=[14, 5, 5, 8])
+    render_production_graph(result, axes[0], G)
+    render_pool_composition(result, axes[1], axes[2])
+    render_cycle_analysis(result, axes[3], G)
+
     plt.tight_layout()
     plt.savefig(out_path, dpi=150)
-    plt.close()
+    plt.close(fig)
     print(f"  Saved {out_path}")
 
 
 def process(name: str):
     print(f"\nProcessing: {name}")
     result = load_result(name)
-
-    render_production_graph(result, DATA_DIR / f'{name}_graph.png')
-    render_pool_composition(result, DATA_DIR / f'{name}_composition.png')
-    render_cycle_analysis(result, DATA_DIR / f'{name}_cycles.png')
+    render_all(result, DATA_DIR / f'{name}_viz.png')
 
 
 if __name__ == '__main__':
@@ -233,6 +316,8 @@ if __name__ == '__main__':
         for name in sys.argv[1:]:
             process(name)
     else:
-        # Process all JSON files
-        for p in sorted(DATA_DIR.glob('*.json')):
-            process(p.stem)
+        # Process all JSON files — each is independent (own output PNGs),
+        # so fan out across cores; Agg is safe per worker process
+        names = [p.stem for p in sorted(DATA_DIR.glob('*.json'))]
+        with Pool(processes=os.cpu_count()) as pool:
+            pool.map(process, names)